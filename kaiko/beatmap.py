@@ -734,21 +734,23 @@ class WidgetManager:
         n = numpy.linspace(1, 88, spec_width*2+1)
         f = 440 * 2**((n-49)/12) # frequency of n-th piano key
         sec = numpy.minimum(n_fft-1, (f/df).round().astype(int))
-        slices = [slice(start, stop) for start, stop in zip(sec[:-1], (sec+1)[1:])]
+        # the i-th bar averages J[starts[i]:stops[i]], computed by differences of cumulative sums
+        starts, stops = sec[:-1], (sec+1)[1:]
+        sizes = (stops - starts) * nchannels
 
         decay = hop_length / samplerate / spec_decay_time / 4
-        volume_of = lambda J: dn.power2db(J.mean() * samplerate / 2, scale=(1e-5, 1e6)) / 60.0
 
         A = numpy.cumsum([0, 2**6, 2**2, 2**1, 2**0])
         B = numpy.cumsum([0, 2**7, 2**5, 2**4, 2**3])
-        draw_bar = lambda a, b: chr(0x2800 + A[int(a*4)] + B[int(b*4)])
 
         node = dn.pipe(dn.frame(win_length, hop_length), dn.power_spectrum(win_length, samplerate=samplerate))
 
         @dn.datanode
         def draw_spectrum():
             with node:
-                vols = [0.0]*(spec_width*2)
+                vols = numpy.zeros(spec_width*2)
+                cumsum = numpy.zeros(n_fft+1)
+                power = numpy.empty(spec_width*2)
 
                 while True:
                     data = yield
@@ -757,9 +759,20 @@ class WidgetManager:
                     except StopIteration:
                         return
 
-                    vols = [max(0.0, prev-decay, min(1.0, volume_of(J[slic])))
-                            for slic, prev in zip(slices, vols)]
-                    field.spectrum = "".join(map(draw_bar, vols[0::2], vols[1::2]))
+                    numpy.cumsum(J.reshape(n_fft, -1).sum(axis=1), out=cumsum[1:])
+                    numpy.subtract(cumsum[stops], cumsum[starts], out=power)
+                    power *= samplerate / 2 / sizes
+                    dn.power2db(power, scale=(1e-5, 1e6), out=power)
+                    power /= 60.0
+                    numpy.minimum(power, 1.0, out=power)
+
+                    vols -= decay
+                    numpy.maximum(vols, power, out=vols)
+                    numpy.maximum(vols, 0.0, out=vols)
+
+                    levels = (vols * 4).astype(int)
+                    codes = 0x2800 + A[levels[0::2]] + B[levels[1::2]]
+                    field.spectrum = "".join(map(chr, codes.tolist()))
 
         handler = dn.pipe(lambda a:a[0], dn.branch(dn.unchunk(draw_spectrum(), (hop_length, nchannels))))
         field.spectrum = "\u2800"*spec_width
@@ -1,6 +1,7 @@
 import re
 import ast
 import enum
+import functools
 import dataclasses
 import typing
 
@@ -49,8 +50,12 @@ def eof(text, start, optional=False):
             return False, start
         raise DecodeError(text, start, ["\000"])
 
+@functools.lru_cache(maxsize=None)
+def _prefixes_regex(prefixes):
+    return re.compile("|".join(re.escape(prefix) for prefix in sorted(prefixes, reverse=True)))
+
 def startswith(prefixes, text, start, optional=False, partial=True):
-    regex = re.compile("|".join(re.escape(prefix) for prefix in sorted(prefixes, reverse=True)))
+    regex = _prefixes_regex(tuple(prefixes))
     m = regex.match(text, start)
     if not m:
         if optional:
@@ -79,33 +84,51 @@ class LiteralBiparser(Biparser):
 
     def decode(self, text, index=0, partial=False):
         res, index = match(self.regex, self.expected, text, index, partial=partial)
-        return ast.literal_eval(res.group()), index
+        return self.from_literal(res.group()), index
+
+    def from_literal(self, literal):
+        return ast.literal_eval(literal)
 
 class NoneBiparser(LiteralBiparser):
-    regex = "None"
+    regex = re.compile("None")
     expected = ["None"]
     type = type(None)
 
+    def from_literal(self, literal):
+        return None
+
 class BoolBiparser(LiteralBiparser):
-    regex = "False|True"
+    regex = re.compile("False|True")
     expected = ["False", "True"]
     type = bool
 
+    def from_literal(self, literal):
+        return literal == "True"
+
 class IntBiparser(LiteralBiparser):
-    regex = r"[-+]?(0|[1-9][0-9]*)(?![0-9\.\+eEjJ])"
+    regex = re.compile(r"[-+]?(0|[1-9][0-9]*)(?![0-9\.\+eEjJ])")
     expected = ["0"]
     type = int
 
+    def from_literal(self, literal):
+        return int(literal)
+
 class FloatBiparser(LiteralBiparser):
-    regex = r"[-+]?([0-9]+\.[0-9]+(e[-+]?[0-9]+)?|[0-9]+[eE][-+]?[0-9]+)(?![0-9\+jJ])"
+    regex = re.compile(r"[-+]?([0-9]+\.[0-9]+(e[-+]?[0-9]+)?|[0-9]+[eE][-+]?[0-9]+)(?![0-9\+jJ])")
     expected = ["0.0"]
     type = float
 
+    def from_literal(self, literal):
+        return float(literal)
+
 class ComplexBiparser(LiteralBiparser):
-    regex = r"[-+]?({0}[-+])?{0}[jJ]".format(r"(0|[1-9][0-9]*|[0-9]+\.[0-9]+(e[-+]?[0-9]+)?|[0-9]+e[-+]?[0-9]+)")
+    regex = re.compile(r"[-+]?({0}[-+])?{0}[jJ]".format(r"(0|[1-9][0-9]*|[0-9]+\.[0-9]+(e[-+]?[0-9]+)?|[0-9]+e[-+]?[0-9]+)"))
     expected = ["0j"]
     type = complex
 
+    def from_literal(self, literal):
+        return complex(literal)
+
     def encode(self, value):
         if not isinstance(value, self.type):
             raise EncodeError(value, "", self.type)
@@ -115,14 +138,14 @@ class ComplexBiparser(LiteralBiparser):
         return repr_value
 
 class StrBiparser(LiteralBiparser):
-    regex = (r'"('
-             r'[^\r\n\\"\x00]'
-             r'|\\[0-7]{1,3}'
-             r'|\\x[0-9a-fA-F]{2}'
-             r'|\\u[0-9a-fA-F]{4}'
-             r'|\\U[0-9a-fA-F]{8}'
-             r'|\\(?![xuUN\x00]).'
-             r')*"')
+    regex = re.compile(r'"('
+                       r'[^\r\n\\"\x00]'
+                       r'|\\[0-7]{1,3}'
+                       r'|\\x[0-9a-fA-F]{2}'
+                       r'|\\u[0-9a-fA-F]{4}'
+                       r'|\\U[0-9a-fA-F]{8}'
+                       r'|\\(?![xuUN\x00]).'
+                       r')*"')
     expected = ['""']
     type = str
 
@@ -130,14 +153,14 @@ class StrBiparser(LiteralBiparser):
         return '"' + repr(value + '"')[1:-2].replace('"', r'\"').replace(r"\'", "'") + '"'
 
 class BytesBiparser(LiteralBiparser):
-    regex = (r'b"('
-             r'(?![\r\n\\"])[\x01-\x7f]'
-             r'|\\[0-7]{1,3}'
-             r'|\\x[0-9a-fA-F]{2}'
-             r'|\\u[0-9a-fA-F]{4}'
-             r'|\\U[0-9a-fA-F]{8}'
-             r'|\\(?![xuUN])[\x01-\x7f]'
-             r')*"')
+    regex = re.compile(r'b"('
+                       r'(?![\r\n\\"])[\x01-\x7f]'
+                       r'|\\[0-7]{1,3}'
+                       r'|\\x[0-9a-fA-F]{2}'
+                       r'|\\u[0-9a-fA-F]{4}'
+                       r'|\\U[0-9a-fA-F]{8}'
+                       r'|\\(?![xuUN])[\x01-\x7f]'
+                       r')*"')
     expected = ['b""']
     type = bytes
 
@@ -145,14 +168,14 @@ class BytesBiparser(LiteralBiparser):
         return 'b"' + repr(value + b'"')[2:-2].replace(b'"', rb'\"').replace(rb"\'", b"'") + '"'
 
 class SStrBiparser(LiteralBiparser):
-    regex = (r"'("
-             r"[^\r\n\\']"
-             r"|\\[0-7]{1,3}"
-             r"|\\x[0-9a-fA-F]{2}"
-             r"|\\u[0-9a-fA-F]{4}"
-             r"|\\U[0-9a-fA-F]{8}"
-             r"|\\(?![xuUN])."
-             r")*'")
+    regex = re.compile(r"'("
+                       r"[^\r\n\\']"
+                       r"|\\[0-7]{1,3}"
+                       r"|\\x[0-9a-fA-F]{2}"
+                       r"|\\u[0-9a-fA-F]{4}"
+                       r"|\\U[0-9a-fA-F]{8}"
+                       r"|\\(?![xuUN])."
+                       r")*'")
     expected = ["''"]
     type = str
 
@@ -161,9 +184,10 @@ class SStrBiparser(LiteralBiparser):
 
 
 class ListBiparser(Biparser):
-    start = r"\[\s*"
-    delimiter = r"\s*,\s*"
-    end = r"\s*\]"
+    start = re.compile(r"\[\s*")
+    delimiter = re.compile(r"\s*,\s*")
+    end = re.compile(r"\s*\]")
+    delimiter_end = re.compile(r"(\s*,\s*)?\s*\]")
 
     def __init__(self, elem_biparser):
         self.elem_biparser = elem_biparser
@@ -180,7 +204,7 @@ class ListBiparser(Biparser):
             value, index = self.elem_biparser.decode(text, index, partial=True)
             res.append(value)
 
-            m, index = match(f"({self.delimiter})?{self.end}", ["]"], text, index, optional=True, partial=partial)
+            m, index = match(self.delimiter_end, ["]"], text, index, optional=True, partial=partial)
             if m: return res, index
 
             _, index = match(self.delimiter, [","], text, index, partial=True)
@@ -201,10 +225,11 @@ class ListBiparser(Biparser):
         return "[" + ", ".join(elems_strs) + "]"
 
 class SetBiparser(Biparser):
-    empty = "set\(\)"
-    start = r"\{\s*"
-    delimiter = r"\s*,\s*"
-    end = r"\s*\}"
+    empty = re.compile(r"set\(\)")
+    start = re.compile(r"\{\s*")
+    delimiter = re.compile(r"\s*,\s*")
+    end = re.compile(r"\s*\}")
+    delimiter_end = re.compile(r"(\s*,\s*)?\s*\}")
 
     def __init__(self, elem_biparser):
         self.elem_biparser = elem_biparser
@@ -221,7 +246,7 @@ class SetBiparser(Biparser):
             value, index = self.elem_biparser.decode(text, index, partial=True)
             res.add(value)
 
-            m, index = match(f"({self.delimiter})?{self.end}", ["}"], text, index, optional=True, partial=partial)
+            m, index = match(self.delimiter_end, ["}"], text, index, optional=True, partial=partial)
             if m: return res, index
 
             _, index = match(self.delimiter, [","], text, index, partial=True)
@@ -245,10 +270,11 @@ class SetBiparser(Biparser):
         return "{" + ", ".join(elems_strs) + "}"
 
 class DictBiparser(Biparser):
-    start = r"\{\s*"
-    colon = r"\s*:\s*"
-    delimiter = r"\s*,\s*"
-    end = r"\s*\}"
+    start = re.compile(r"\{\s*")
+    colon = re.compile(r"\s*:\s*")
+    delimiter = re.compile(r"\s*,\s*")
+    end = re.compile(r"\s*\}")
+    delimiter_end = re.compile(r"(\s*,\s*)?\s*\}")
 
     def __init__(self, key_biparser, value_biparser):
         self.key_biparser = key_biparser
@@ -268,7 +294,7 @@ class DictBiparser(Biparser):
             value, index = self.value_biparser.decode(text, index, partial=True)
             res[key] = value
 
-            m, index = match(f"({self.delimiter})?{self.end}", ["}"], text, index, optional=True, partial=partial)
+            m, index = match(self.delimiter_end, ["}"], text, index, optional=True, partial=partial)
             if m: return res, index
 
             _, index = match(self.delimiter, [","], text, index, partial=True)
@@ -295,9 +321,9 @@ class DictBiparser(Biparser):
         return "{" + ", ".join(items_str) + "}"
 
 class TupleBiparser(Biparser):
-    start = r"\(\s*"
-    delimiter = r"\s*,\s*"
-    end = r"\s*\)"
+    start = re.compile(r"\(\s*")
+    delimiter = re.compile(r"\s*,\s*")
+    end = re.compile(r"\s*\)")
 
     def __init__(self, elems_biparsers):
         self.elems_biparsers = elems_biparsers
@@ -335,29 +361,31 @@ class TupleBiparser(Biparser):
         if length == 0:
             return "()"
         elif length == 1:
-            return "(" + elems_str[0] + ",)"
+            return f"({elems_str[0]},)"
         else:
-            return "(" + ", ".join(elems_str) + ")"
+            return f"({', '.join(elems_str)})"
 
 class DataclassBiparser(Biparser):
-    start = r"\(\s*"
+    start = re.compile(r"\(\s*")
     keyequal = r"\s*{}\s*=\s*"
-    delimiter = r"\s*,\s*"
-    end = r"\s*\)"
+    delimiter = re.compile(r"\s*,\s*")
+    end = re.compile(r"\s*\)")
 
     def __init__(self, clz, fields_biparsers):
         self.clz = clz
         self.fields_biparsers = fields_biparsers
+        self.prefix = clz.__name__ + "("
+        self.keyequals = {name: re.compile(self.keyequal.format(re.escape(name))) for name in fields_biparsers}
 
     def decode(self, text, index=0, partial=False):
         res = dict()
 
-        _, index = startswith([self.clz.__name__ + "("], text, index, partial=True)
+        _, index = startswith([self.prefix], text, index, partial=True)
 
         length = len(self.fields_biparsers)
         if length > 0:
             for i, (name, biparser) in enumerate(self.fields_biparsers.items()):
-                _, index = match(self.keyequal.format(re.escape(name)), [name + "="], text, index, partial=True)
+                _, index = match(self.keyequals[name], [name + "="], text, index, partial=True)
                 value, index = biparser.decode(text, index, partial=True)
                 res[name] = value
 
@@ -411,17 +439,26 @@ class UnionBiparser(Biparser):
         raise EncodeError(value, "", [])
 
 class EnumBiparser(Biparser):
-    nameperiod = r"{}\."
+    word = re.compile(r"\w+")
 
     def __init__(self, enum_class):
         self.enum_class = enum_class
+        self.prefix = enum_class.__name__ + "."
         self.options = sorted(list(enum_class), key=lambda e:e.name, reverse=True)
+        self.names = [option.name for option in self.options]
+        self.names_set = set(self.names)
 
     def decode(self, text, index=0, partial=False):
-        name = self.enum_class.__name__
-        _, index = match(self.nameperiod.format(re.escape(name)), [name + "."], text, index, partial=True)
+        if not text.startswith(self.prefix, index):
+            raise DecodeError(text, index, [self.prefix])
+        index += len(self.prefix)
+
+        # fast path: look up the whole word directly
+        m = self.word.match(text, index)
+        if m and m.group() in self.names_set and (partial or m.end() == len(text)):
+            return getattr(self.enum_class, m.group()), m.end()
 
-        option, index = startswith([option.name for option in self.options], text, index, partial=partial)
+        option, index = startswith(self.names, text, index, partial=partial)
         option = getattr(self.enum_class, option)
         return option, index
 
@@ -432,6 +469,26 @@ class EnumBiparser(Biparser):
 
 
 def from_type_hint(type_hint):
+    # `Union[int, str] == Union[str, int]`, so the cache is keyed by the order of the
+    # arguments as well, which determines the order of options of `UnionBiparser`
+    try:
+        key = _type_hint_key(type_hint)
+        hash(key)
+    except TypeError:
+        return _from_type_hint(type_hint)
+    return _from_type_hint_cached(key, type_hint)
+
+def _type_hint_key(type_hint):
+    args = getattr(type_hint, '__args__', None)
+    if not isinstance(args, tuple):
+        return type_hint
+    return (type_hint, tuple(_type_hint_key(arg) for arg in args))
+
+@functools.lru_cache(maxsize=None)
+def _from_type_hint_cached(key, type_hint):
+    return _from_type_hint(type_hint)
+
+def _from_type_hint(type_hint):
     if type_hint is None:
         type_hint = type(None)
 
@@ -1,6 +1,6 @@
 import re
 import typing
-from collections import OrderedDict
+import functools
 from pathlib import Path
 from . import biparsers as bp
 
@@ -14,14 +14,8 @@ class FieldBiparser(bp.Biparser):
         current_type = self.config_type
 
         while hasattr(current_type, '__configurable_fields__'):
-            fields = {}
-            for field_name, field_type in current_type.__configurable_fields__.items():
-                field_key = field_name
-                if hasattr(field_type, '__configurable_fields__'):
-                    field_key = field_key + "."
-                fields[field_key] = (field_name, field_type)
-
-            option, index = bp.startswith(list(fields.keys()), text, index, partial=True)
+            fields = current_type.__configurable_keys__
+            option, index = bp.startswith(fields.keys(), text, index, partial=True)
 
             current_field, current_type = fields[option]
             current_fields.append(current_field)
@@ -45,21 +39,22 @@ class FieldBiparser(bp.Biparser):
         return ".".join(value)
 
 class ConfigurationBiparser(bp.Biparser):
-    vindent = r"(#[^\n]*|[ ]*)(\n|$)"
-    name = r"#### ([^\n]*) ####(\n|$)"
-    profile = r"# #### ([^\n]*) ####(\n#[^\n]*)*(\n|$)"
-    equal = r"[ ]*=[ ]*"
-    nl = r"[ ]*(\n|$)"
+    vindent = re.compile(r"(#[^\n]*|[ ]*)(\n|$)")
+    name = re.compile(r"#### ([^\n]*) ####(\n|$)")
+    profile = re.compile(r"# #### ([^\n]*) ####(\n#[^\n]*)*(\n|$)")
+    equal = re.compile(r"[ ]*=[ ]*")
+    nl = re.compile(r"[ ]*(\n|$)")
 
     def __init__(self, config_type):
         self.config_type = config_type
         self.field_biparser = FieldBiparser(config_type)
+        self.value_biparsers = {field_key: bp.from_type_hint(field_type)
+                                for field_key, field_type in config_type.get_configurable_fields().items()}
 
     def decode(self, text, index=0, partial=False):
         # exec(text, globals(), config.current.__dict__)
 
-        config = Configuration(self.config_type)
-        field_hints = self.config_type.get_configurable_fields()
+        config = Configuration(self.config_type, biparser=self)
         is_named = False
 
         while index < len(text):
@@ -82,7 +77,7 @@ class ConfigurationBiparser(bp.Biparser):
 
             _, index = bp.match(self.equal, [" = "], text, index, partial=True)
 
-            value_biparser = bp.from_type_hint(field_hints[field])
+            value_biparser = self.value_biparsers[field]
             value, index = value_biparser.decode(text, index, partial=True)
             config.set(field, value)
 
@@ -96,9 +91,8 @@ class ConfigurationBiparser(bp.Biparser):
         if value.name is not None:
             res += f"#### {value.name} ####\n"
 
-        for field_key, field_type in self.config_type.get_configurable_fields().items():
+        for field_key, value_biparser in self.value_biparsers.items():
             field_name = self.field_biparser.encode(field_key)
-            value_biparser = bp.from_type_hint(field_type)
             if not value.has(field_key):
                 continue
             field_value = value.get(field_key)
@@ -116,7 +110,7 @@ class ConfigurableMeta(type):
             self.__configurable_excludes__ = []
         annotations = typing.get_type_hints(self)
 
-        fields = OrderedDict()
+        fields = {}
         for name in dir(self):
             if name in annotations and name not in self.__configurable_excludes__:
                 fields[name] = annotations[name]
@@ -124,10 +118,22 @@ class ConfigurableMeta(type):
                 fields[name] = getattr(self, name)
         self.__configurable_fields__ = fields
 
-    def __configurable_init__(self, instance):
-        for field_name, field_type in self.__configurable_fields__.items():
+        keys = {}
+        for field_name, field_type in fields.items():
+            field_key = field_name
             if hasattr(field_type, '__configurable_fields__'):
-                instance.__dict__[field_name] = field_type()
+                field_key = field_key + "."
+            keys[field_key] = (field_name, field_type)
+        self.__configurable_keys__ = keys
+
+        self.__configurable_subconfigs__ = [(field_name, field_type)
+                                            for field_name, field_type in fields.items()
+                                            if hasattr(field_type, '__configurable_fields__')]
+
+    def __configurable_init__(self, instance):
+        instance_dict = instance.__dict__
+        for field_name, field_type in self.__configurable_subconfigs__:
+            instance_dict[field_name] = field_type()
 
     def __call__(self, *args, **kwargs):
         instance = self.__new__(self, *args, **kwargs)
@@ -135,6 +141,7 @@ class ConfigurableMeta(type):
         self.__init__(instance, *args, **kwargs)
         return instance
 
+    @functools.lru_cache(maxsize=None)
     def get_configurable_fields(self):
         field_hints = {}
         for field_name, field_type in self.__configurable_fields__.items():
@@ -150,12 +157,12 @@ class Configurable(metaclass=ConfigurableMeta):
     pass
 
 class Configuration:
-    def __init__(self, config_type, name=None, current=None, profiles=None):
+    def __init__(self, config_type, name=None, current=None, profiles=None, biparser=None):
         self.config_type = config_type
         self.name = name or "default"
         self.current = current or config_type()
         self.profiles = profiles or {}
-        self.biparser = ConfigurationBiparser(config_type)
+        self.biparser = biparser or ConfigurationBiparser(config_type)
 
     def set(self, fields, value):
         if len(fields) == 0:
@@ -240,7 +247,9 @@ class Configuration:
         if not path.exists():
             raise ValueError("No such file: " + str(path))
 
-        res, _ = self.biparser.decode(open(path, 'r').read())
+        with open(path, 'r') as file:
+            text = file.read()
+        res, _ = self.biparser.decode(text)
         self.current = res.current
         self.profiles = res.profiles
 
@@ -250,7 +259,9 @@ class Configuration:
     def write(self, path):
         if isinstance(path, str):
             path = Path(path)
-        open(path, 'w').write(self.biparser.encode(self))
+        text = self.biparser.encode(self)
+        with open(path, 'w') as file:
+            file.write(text)
 
     def use(self, name):
         if name == self.name:
@@ -258,7 +269,7 @@ class Configuration:
         if name not in self.profiles:
             raise ValueError("no such profile: " + name)
 
-        curr = Configuration(self.config_type, self.name, self.current, {})
+        curr = Configuration(self.config_type, self.name, self.current, {}, self.biparser)
         res = re.sub(r"((?<=\n)|^)(?!$)", "# ", self.biparser.encode(curr))
         self.profiles[self.name] = res
 
@@ -271,7 +282,7 @@ class Configuration:
         if clone is not None and clone != self.name and clone not in self.profiles:
             raise ValueError("no such profile: " + clone)
 
-        curr = Configuration(self.config_type, self.name, self.current, {})
+        curr = Configuration(self.config_type, self.name, self.current, {}, self.biparser)
         res = re.sub(r"((?<=\n)|^)(?!$)", "# ", self.biparser.encode(curr))
         self.profiles[self.name] = res
 
@@ -1,15 +1,18 @@
 import time
+import math
 import functools
 import itertools
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import contextlib
 import queue
 import threading
 import signal
 import bisect
+import heapq
 import numpy
 import scipy
 import scipy.signal
+import scipy.fft
 import pyaudio
 import wave
 import audioread
@@ -137,12 +140,12 @@ def delay(prepend):
     prepend = DataNode.wrap(prepend)
 
     with prepend:
-        buffer = list(prepend)
+        buffer = deque(prepend)
 
     data = yield
     while True:
         buffer.append(data)
-        data = yield buffer.pop(0)
+        data = yield buffer.popleft()
 
 @datanode
 def skip(node, prefeed):
@@ -230,20 +233,25 @@ def pipe(*nodes):
     data : any
         The processed signal.
     """
-    nodes = [DataNode.wrap(node) for node in nodes]
+    # plain functions are called directly instead of being wrapped into data nodes
+    is_func = lambda node: (not isinstance(node, DataNode)
+                            and not hasattr(node, '__iter__')
+                            and hasattr(node, '__call__'))
+    nodes = [node if is_func(node) else DataNode.wrap(node) for node in nodes]
     with contextlib.ExitStack() as stack:
         for node in nodes:
-            stack.enter_context(node)
+            if isinstance(node, DataNode):
+                stack.enter_context(node)
 
-        data = yield
-        while True:
-            res = data
-            for node in nodes:
-                try:
-                    res = node.send(res)
-                except StopIteration:
-                    return
-            data = yield res
+        sends = [node.send if isinstance(node, DataNode) else node for node in nodes]
+        try:
+            data = yield
+            while True:
+                for send in sends:
+                    data = send(data)
+                data = yield data
+        except StopIteration:
+            return
 
 @datanode
 def pair(*nodes):
@@ -269,14 +277,13 @@ def pair(*nodes):
         for node in nodes:
             stack.enter_context(node)
 
+        sends = [node.send for node in nodes]
         data = yield
         while True:
-            data_ = []
-            for node, subdata in zip(nodes, data):
-                try:
-                    data_.append(node.send(subdata))
-                except StopIteration:
-                    return
+            try:
+                data_ = [send(subdata) for send, subdata in zip(sends, data)]
+            except StopIteration:
+                return
             data = yield tuple(data_)
 
 @datanode
@@ -394,33 +401,51 @@ def pick_peak(pre_max, post_max, pre_avg, post_avg, wait, delta):
     """
     center = max(pre_max, pre_avg)
     delay = max(post_max, post_avg)
-    buffer = numpy.zeros(center+delay+1, dtype=numpy.float32)
-    max_buffer = buffer[center-pre_max:center+post_max+1]
-    avg_buffer = buffer[center-pre_avg:center+post_avg+1]
+    # circular buffer of the last `size` samples, starting from `head`
+    size = center+delay+1
+    buffer = [0.0]*size
+    head = 0
     index = -delay
     prev_index = -wait
 
-    buffer[-1] = yield
+    # sliding maximum by a decreasing queue of (index, value), and sliding sum for average
+    max_queue = deque([(index+post_max, 0.0)])
+    avg_sum = 0.0
+    avg_length = pre_avg+post_avg+1
+
+    buffer[-1] = float((yield))
     while True:
         index += 1
-        strength = buffer[center]
+        strength = buffer[(head+center) % size]
+
+        value = buffer[(head+center+post_max) % size]
+        while max_queue and max_queue[-1][1] <= value:
+            max_queue.pop()
+        max_queue.append((index+post_max, value))
+        if max_queue[0][0] < index-pre_max:
+            max_queue.popleft()
+        avg_sum += buffer[(head+center+post_avg) % size]
+
         detected = True
         detected = detected and index > prev_index + wait
-        detected = detected and strength == max_buffer.max()
-        detected = detected and strength >= avg_buffer.mean() + delta
+        detected = detected and strength == max_queue[0][1]
+        detected = detected and strength >= avg_sum / avg_length + delta
 
         if detected:
             prev_index = index
-        buffer[:-1] = buffer[1:]
-        buffer[-1] = yield detected
+        avg_sum -= buffer[(head+center-pre_avg) % size]
+        buffer[head] = float((yield detected))
+        head = (head+1) % size
 
 
 # for async processes
 class TimedVariable:
     def __init__(self, value=None, duration=numpy.inf):
-        self._queue = queue.Queue()
+        self._queue = deque()
         self._lock = threading.Lock()
+        # min-heap of (start, order, value, duration)
         self._scheduled = []
+        self._order = itertools.count()
         self._default_value = value
         self._default_duration = duration
         self._item = (value, None, numpy.inf)
@@ -431,15 +456,14 @@ class TimedVariable:
             if start is None:
                 start = time
 
-            while not self._queue.empty():
-                item = self._queue.get()
-                if item[1] is None:
-                    item = (item[0], time, item[2])
-                self._scheduled.append(item)
-            self._scheduled.sort(key=lambda item: item[1])
+            while self._queue:
+                value_, start_, duration_ = self._queue.popleft()
+                if start_ is None:
+                    start_ = time
+                heapq.heappush(self._scheduled, (start_, next(self._order), value_, duration_))
 
-            while self._scheduled and self._scheduled[0][1] <= time:
-                value, start, duration = self._scheduled.pop(0)
+            while self._scheduled and self._scheduled[0][0] <= time:
+                start, _, value, duration = heapq.heappop(self._scheduled)
 
             if start + duration <= time:
                 value, start, duration = self._default_value, None, numpy.inf
@@ -450,10 +474,10 @@ class TimedVariable:
     def set(self, value, start=None, duration=None):
         if duration is None:
             duration = self._default_duration
-        self._queue.put((value, start, duration))
+        self._queue.append((value, start, duration))
 
     def reset(self, start=None):
-        self._queue.put((self._default_value, start, numpy.inf))
+        self._queue.append((self._default_value, start, numpy.inf))
 
 class Scheduler(DataNode):
     """A data node schedule given data nodes dynamically.
@@ -470,18 +494,22 @@ class Scheduler(DataNode):
     """
 
     def __init__(self):
-        self.queue = queue.Queue()
+        self.queue = deque()
         super().__init__(self.proxy())
 
     def proxy(self):
         nodes = OrderedDict()
+        # the sorted order is reused until nodes change, unless some zindex is dynamic
+        order = []
+        is_dynamic = False
 
         try:
             data, *meta = yield
 
             while True:
-                while not self.queue.empty():
-                    key, node, zindex = self.queue.get()
+                is_changed = False
+                while self.queue:
+                    key, node, zindex = self.queue.popleft()
                     if key in nodes:
                         nodes[key][0].__exit__()
                         del nodes[key]
@@ -489,12 +517,18 @@ class Scheduler(DataNode):
                         node.__enter__()
                         zindex_func = zindex if hasattr(zindex, '__call__') else lambda z=zindex: z
                         nodes[key] = (node, zindex_func)
+                        is_dynamic = is_dynamic or hasattr(zindex, '__call__')
+                    is_changed = True
 
-                for key, (node, _) in sorted(nodes.items(), key=lambda item: item[1][1]()):
+                if is_changed or is_dynamic:
+                    order = sorted(nodes.items(), key=lambda item: item[1][1]())
+
+                for key, (node, _) in order:
                     try:
                         data = node.send((data, *meta))
                     except StopIteration:
                         del nodes[key]
+                        order = [item for item in order if item[0] is not key]
 
                 data, *meta = yield data
 
@@ -524,11 +558,11 @@ class Scheduler(DataNode):
 
     def add_node(self, node, zindex=(0,)):
         key = self._NodeKey(self, node)
-        self.queue.put((key, node, zindex))
+        self.queue.append((key, node, zindex))
         return key
 
     def remove_node(self, key):
-        self.queue.put((key, None, (0,)))
+        self.queue.append((key, None, (0,)))
 
 @datanode
 def interval(producer=lambda _:None, consumer=lambda _:None, dt=0.0, t0=0.0):
@@ -540,10 +574,10 @@ def interval(producer=lambda _:None, consumer=lambda _:None, dt=0.0, t0=0.0):
     def run():
         nonlocal error
         try:
-            ref_time = time.time()
+            ref_time = time.perf_counter()
 
             for i, data in enumerate(producer):
-                delta = ref_time+t0+i*dt - time.time()
+                delta = ref_time+t0+i*dt - time.perf_counter()
                 if stop_event.wait(delta) if delta > 0 else stop_event.is_set():
                     break
 
@@ -574,14 +608,14 @@ def interval(producer=lambda _:None, consumer=lambda _:None, dt=0.0, t0=0.0):
 def tick(dt, t0=0.0, shift=0.0, stop_event=None):
     if stop_event is None:
         stop_event = threading.Event()
-    ref_time = time.time()
+    ref_time = time.perf_counter()
 
     yield
     for i in itertools.count():
-        if stop_event.wait(max(0.0, ref_time+t0+i*dt - time.time())):
+        if stop_event.wait(max(0.0, ref_time+t0+i*dt - time.perf_counter())):
             break
 
-        yield time.time()-ref_time+shift
+        yield time.perf_counter()-ref_time+shift
 
 @datanode
 def timeit(node, log=print):
@@ -695,7 +729,8 @@ def frame(win_length, hop_length):
     Yields
     ------
     data : ndarray
-        The framed signal.
+        The framed signal.  It is a view of an internal buffer, which is only
+        valid until the next signal is sent.
     """
     if win_length < hop_length:
         data = yield
@@ -703,14 +738,22 @@ def frame(win_length, hop_length):
             data = yield numpy.copy(data[-win_length:])
         return
 
+    # append to a long buffer and yield the window ending at `tail`; when the buffer is
+    # full, move the last window (minus one hop) to the front, once every few hops
+    periods = win_length // hop_length + 1
     data_last = yield
-    data = numpy.zeros((win_length, *data_last.shape[1:]), dtype=numpy.float32)
-    data[-hop_length:] = data_last
+    data = numpy.zeros((win_length + hop_length*periods, *data_last.shape[1:]), dtype=numpy.float32)
+    keep = win_length - hop_length
+    tail = win_length
 
     while True:
-        data_last = yield numpy.copy(data)
-        data[:-hop_length] = data[hop_length:]
-        data[-hop_length:] = data_last
+        if tail + hop_length > data.shape[0]:
+            data[:keep] = data[tail-keep:tail]
+            tail = keep
+        data[tail:tail+hop_length] = data_last
+        tail += hop_length
+
+        data_last = yield data[tail-win_length:tail]
 
 @datanode
 def power_spectrum(win_length, samplerate=44100, windowing=True, weighting=True):
@@ -741,21 +784,34 @@ def power_spectrum(win_length, samplerate=44100, windowing=True, weighting=True)
     Yields
     ------
     J : ndarray
-        The power spectrum, with length `win_length//2+1`.
+        The power spectrum, with length `win_length//2+1`.  Output buffers are
+        reused every other frame, so only the previous spectrum stays valid.
     """
     if isinstance(windowing, bool):
         windowing = get_Hann_window(win_length) if windowing else 1
+    windowing = numpy.ascontiguousarray(windowing, dtype=numpy.float32)
     if isinstance(weighting, bool):
         weighting = get_A_weight(samplerate, win_length) if weighting else 1
-    weighting *= 2/win_length/samplerate
+    weighting = numpy.asarray(weighting * (2/win_length/samplerate), dtype=numpy.float32)
+
+    # build and cache the FFT plan before the first frame arrives
+    scipy.fft.rfft(numpy.zeros(win_length, dtype=numpy.float32))
 
     x = yield
     if x.ndim > 1:
-        windowing = windowing[:, None] if numpy.ndim(windowing) > 0 else windowing
-        weighting = weighting[:, None] if numpy.ndim(weighting) > 0 else weighting
+        windowing = windowing[:, None] if windowing.ndim > 0 else windowing
+        weighting = weighting[:, None] if weighting.ndim > 0 else weighting
+    x_windowed = numpy.empty(x.shape, dtype=numpy.float32)
+    J_shape = (x.shape[0]//2+1, *x.shape[1:])
+    J, J_next = numpy.empty(J_shape, dtype=numpy.float32), numpy.empty(J_shape, dtype=numpy.float32)
 
     while True:
-        x = yield weighting * numpy.abs(numpy.fft.rfft(x*windowing, axis=0))**2
+        numpy.multiply(x, windowing, out=x_windowed)
+        numpy.abs(scipy.fft.rfft(x_windowed, axis=0, overwrite_x=True), out=J)
+        numpy.square(J, out=J)
+        J *= weighting
+        x = yield J
+        J, J_next = J_next, J
 
 @datanode
 def onset_strength(df):
@@ -777,9 +833,16 @@ def onset_strength(df):
         The onset strength between previous and current input spectrum.
     """
     curr = yield
+    # keep a private copy of the previous spectrum, so senders may reuse their buffers
     prev = numpy.zeros_like(curr)
+    diff = numpy.empty_like(curr)
+    # sum over frequencies and average over channels in one reduction
+    scale = df * curr.shape[0] / curr.size
     while True:
-        prev, curr = curr, (yield numpy.mean(numpy.maximum(0.0, curr - prev).sum(axis=0)) * df)
+        numpy.subtract(curr, prev, out=diff)
+        numpy.maximum(diff, 0.0, out=diff)
+        numpy.copyto(prev, curr)
+        curr = yield diff.sum() * scale
 
 
 # for variable-width data
@@ -838,7 +901,9 @@ def unchunk(node, chunk_shape=1024):
     node : DataNode
         The data node to unchunk.
     chunk_shape : int or tuple, optional
-        The received shape of given data node, default is `1024`.
+        The received shape of given data node, default is `1024`.  The chunks
+        sent to the node are reused every other chunk, so only the previous
+        chunk stays valid.
 
     Receives
     ------
@@ -849,7 +914,7 @@ def unchunk(node, chunk_shape=1024):
 
     with node:
         try:
-            chunk = numpy.zeros(chunk_shape, dtype=numpy.float32)
+            chunk, chunk_next = numpy.zeros(chunk_shape, dtype=numpy.float32), numpy.zeros(chunk_shape, dtype=numpy.float32)
             index = 0
 
             data = yield
@@ -863,7 +928,7 @@ def unchunk(node, chunk_shape=1024):
 
                 if index == chunk.shape[0]:
                     node.send(chunk)
-                    chunk = numpy.zeros(chunk_shape, dtype=numpy.float32)
+                    chunk, chunk_next = chunk_next, chunk
                     index = 0
 
                 if jndex == data.shape[0]:
@@ -875,6 +940,7 @@ def unchunk(node, chunk_shape=1024):
 
         except GeneratorExit:
             if index > 0:
+                chunk[index:] = 0.0
                 try:
                     node.send(chunk)
                 except StopIteration:
@@ -927,10 +993,21 @@ def rechannel(channels):
     data : ndarray
         The rechanneled signal.
     """
-    if channels == 0:
-        return lambda data: (data if data.ndim == 1 else numpy.mean(data, axis=1))
-    elif isinstance(channels, int):
-        return lambda data: (data if data.ndim == 1 else numpy.mean(data, axis=1))[:, None][:, [0]*channels]
+    if isinstance(channels, int):
+        # mix down and spread by one matrix product, instead of averaging and indexing
+        mixers = {}
+        def rechannel_func(data):
+            if data.ndim == 1:
+                if channels == 0:
+                    return data
+                data = data[:, None]
+
+            nin = data.shape[1]
+            if nin not in mixers:
+                shape = (nin,) if channels == 0 else (nin, channels)
+                mixers[nin] = numpy.full(shape, 1/nin, dtype=numpy.float32)
+            return data @ mixers[nin]
+        return rechannel_func
     else:
         return lambda data: (data[:, None] if data.ndim == 1 else data)[:, channels]
 
@@ -1032,7 +1109,9 @@ def load(filename):
             scale = 2.0 ** (1 - 8*width)
             fmt = f'<i{width}'
             def frombuffer(data):
-                return scale * numpy.frombuffer(data, fmt).astype(numpy.float32).reshape(-1, nchannels)
+                # convert and scale in one pass, without an intermediate float array
+                data = numpy.frombuffer(data, fmt).reshape(-1, nchannels)
+                return numpy.multiply(data, scale, dtype=numpy.float32)
 
             remaining = file.getnframes()
             while remaining > 0:
@@ -1046,7 +1125,8 @@ def load(filename):
             scale = 2.0 ** (1 - 8*width)
             fmt = f'<i{width}'
             def frombuffer(data):
-                return scale * numpy.frombuffer(data, fmt).astype(numpy.float32).reshape(-1, file.channels)
+                data = numpy.frombuffer(data, fmt).reshape(-1, file.channels)
+                return numpy.multiply(data, scale, dtype=numpy.float32)
 
             for data in file:
                 yield frombuffer(data)
@@ -1075,7 +1155,8 @@ def save(filename, samplerate=44100, channels=1, width=2):
         scale = 2.0 ** (8*width - 1)
         fmt = f'<i{width}'
         def tobuffer(data):
-            return (data * scale).astype(fmt).tobytes()
+            # `writeframes` takes any bytes-like object, so skip the copy into bytes
+            return numpy.multiply(data, scale, out=numpy.empty(data.shape, dtype=fmt), casting='unsafe')
 
         file.setsampwidth(width)
         file.setnchannels(channels)
@@ -1094,7 +1175,8 @@ def record(manager, node, samplerate=44100, buffer_shape=1024, format='f4', devi
     manager : pyaudio.PyAudio
         The PyAudio object.
     node : DataNode
-        The data node to process recorded sound.
+        The data node to process recorded sound.  The received signal is only
+        valid until the next buffer is recorded.
     samplerate : int, optional
         The sample rate of input signal, default is `44100`.
     buffer_shape : int or tuple, optional
@@ -1118,11 +1200,11 @@ def record(manager, node, samplerate=44100, buffer_shape=1024, format='f4', devi
                  }[format]
 
     scale = 2.0 ** (8*int(format[1]) - 1)
-    normalize = {'f4': (lambda d: d),
-                 'i4': (lambda d: d / scale),
-                 'i2': (lambda d: d / scale),
-                 'i1': (lambda d: d / scale),
-                 'u1': (lambda d: (d - 64) / 64),
+    normalize = {'f4': (lambda d, out: d),
+                 'i4': (lambda d, out: numpy.multiply(d, 1/scale, out=out, dtype=numpy.float32)),
+                 'i2': (lambda d, out: numpy.multiply(d, 1/scale, out=out, dtype=numpy.float32)),
+                 'i1': (lambda d, out: numpy.multiply(d, 1/scale, out=out, dtype=numpy.float32)),
+                 'u1': (lambda d, out: numpy.subtract(numpy.multiply(d, 1/64, out=out, dtype=numpy.float32), 1.0, out=out)),
                  }[format]
 
     if device == -1:
@@ -1130,10 +1212,11 @@ def record(manager, node, samplerate=44100, buffer_shape=1024, format='f4', devi
 
     error = queue.Queue()
     length, channels = (buffer_shape, 1) if isinstance(buffer_shape, int) else buffer_shape
+    buffer = numpy.empty(buffer_shape, dtype=numpy.float32)
 
     def input_callback(in_data, frame_count, time_info, status):
         try:
-            data = normalize(numpy.frombuffer(in_data, dtype=format).reshape(buffer_shape))
+            data = normalize(numpy.frombuffer(in_data, dtype=format).reshape(buffer_shape), buffer)
             node.send(data)
 
             return b"", pyaudio.paContinue
@@ -1199,11 +1282,11 @@ def play(manager, node, samplerate=44100, buffer_shape=1024, format='f4', device
                  }[format]
 
     scale = 2.0 ** (8*int(format[1]) - 1)
-    normalize = {'f4': (lambda d: d),
-                 'i4': (lambda d: d * scale),
-                 'i2': (lambda d: d * scale),
-                 'i1': (lambda d: d * scale),
-                 'u1': (lambda d: d * 64 + 64),
+    normalize = {'f4': (lambda d, out: numpy.copyto(out, d)),
+                 'i4': (lambda d, out: numpy.multiply(d, scale, out=out, casting='unsafe')),
+                 'i2': (lambda d, out: numpy.multiply(d, scale, out=out, casting='unsafe')),
+                 'i1': (lambda d, out: numpy.multiply(d, scale, out=out, casting='unsafe')),
+                 'u1': (lambda d, out: numpy.copyto(out, d * 64 + 64, casting='unsafe')),
                  }[format]
 
     if device == -1:
@@ -1211,11 +1294,14 @@ def play(manager, node, samplerate=44100, buffer_shape=1024, format='f4', device
 
     error = queue.Queue()
     length, channels = (buffer_shape, 1) if isinstance(buffer_shape, int) else buffer_shape
+    buffer = numpy.empty(buffer_shape, dtype=format)
 
     def output_callback(in_data, frame_count, time_info, status):
         try:
             data = node.send(None)
-            out_data = normalize(data).astype(format).tobytes()
+            out = buffer if data.shape == buffer.shape else numpy.empty(data.shape, dtype=format)
+            normalize(data, out)
+            out_data = out.tobytes()
 
             return out_data, pyaudio.paContinue
         except StopIteration:
@@ -1354,7 +1440,7 @@ def show_ctxt(stream, hide_cursor=False, end="\n"):
         stream.flush()
 
 @datanode
-def show(node, dt, t0=0, stream=None, hide_cursor=False, end="\n"):
+def show(node, dt, t0=0, stream=None, hide_cursor=False, end="\n", refresh_period=0.0):
     import sys
 
     node = DataNode.wrap(node)
@@ -1367,17 +1453,26 @@ def show(node, dt, t0=0, stream=None, hide_cursor=False, end="\n"):
     def run():
         nonlocal error
         try:
-            ref_time = time.time()
+            ref_time = time.perf_counter()
+            last_view = None
+            last_time = ref_time
 
             for i, view in enumerate(node):
-                delta = ref_time+t0+i*dt - time.time()
+                frame_time = ref_time+t0+i*dt
+                delta = frame_time - time.perf_counter()
                 if delta < 0:
                     continue
                 if stop_event.wait(delta):
                     break
 
+                # skip unchanged frames, but redraw after `refresh_period` to repair the terminal
+                if view == last_view and frame_time < last_time + refresh_period:
+                    continue
+
                 stream.write(view)
                 stream.flush()
+                last_view = view
+                last_time = frame_time
 
         except Exception as e:
             error = e
@@ -1419,7 +1514,7 @@ def terminal_size():
 
 # not data nodes
 def filter(x, distr):
-    return numpy.fft.irfft(numpy.fft.rfft(x, axis=0) * distr, axis=0)
+    return scipy.fft.irfft(scipy.fft.rfft(x, axis=0) * distr, axis=0)
 
 def pulse(samplerate=44100, freq=1000.0, decay_time=0.01, amplitude=1.0, length=None):
     if length is None:
@@ -1427,20 +1522,34 @@ def pulse(samplerate=44100, freq=1000.0, decay_time=0.01, amplitude=1.0, length=
     t = numpy.linspace(0, length, int(length*samplerate), endpoint=False, dtype=numpy.float32)
     return amplitude * 2**(-t/decay_time) * numpy.sin(2 * numpy.pi * freq * t)
 
-def power2db(power, scale=(1e-5, 1e6)):
-    return 10.0 * numpy.log10(numpy.maximum(scale[0], power*scale[1]))
+def power2db(power, scale=(1e-5, 1e6), out=None):
+    if out is None:
+        return 10.0 * numpy.log10(numpy.maximum(scale[0], power*scale[1]))
 
+    numpy.multiply(power, scale[1], out=out)
+    numpy.maximum(out, scale[0], out=out)
+    numpy.log10(out, out=out)
+    out *= 10.0
+    return out
+
+@functools.lru_cache(maxsize=32)
 def get_Hann_window(win_length):
     a = numpy.linspace(0, numpy.pi, win_length)
     window = numpy.sin(a)**2
     gain = (3/8)**0.5 # (window**2).mean()**0.5
-    return window / gain
+    window = (window / gain).astype(numpy.float32)
+    window.flags.writeable = False
+    return window
 
+@functools.lru_cache(maxsize=32)
 def get_half_Hann_window(win_length):
     a = numpy.linspace(0, numpy.pi/2, win_length)
     window = numpy.sin(a)**2
+    window = window.astype(numpy.float32)
+    window.flags.writeable = False
     return window
 
+@functools.lru_cache(maxsize=32)
 def get_A_weight(samplerate, win_length):
     f = numpy.arange(win_length//2+1) * (samplerate/win_length)
 
@@ -1467,6 +1576,7 @@ def get_A_weight(samplerate, win_length):
     weight[f<10] = 0.0
     weight[f>20000] = 0.0
 
+    weight.flags.writeable = False
     return weight
 
 def load_sound(filepath, samplerate=None, channels=None, volume=0.0, start=None, end=None, chunk_length=1024):
@@ -1487,7 +1597,10 @@ def load_sound(filepath, samplerate=None, channels=None, volume=0.0, start=None,
     # resample
     if samplerate is not None and file_samplerate != samplerate:
         length = int(sound.shape[0] * samplerate/file_samplerate)
-        sound = scipy.signal.resample(sound, length, axis=0)
+        # polyphase filtering instead of one FFT over the whole (arbitrary length) sound
+        gcd = math.gcd(int(samplerate), int(file_samplerate))
+        up, down = int(samplerate)//gcd, int(file_samplerate)//gcd
+        sound = scipy.signal.resample_poly(sound, up, down, axis=0)[:length]
 
     # rechannel
     if sound.ndim == 1:
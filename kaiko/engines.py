@@ -3,8 +3,8 @@ import itertools
 import functools
 import re
 import contextlib
+from collections import deque
 from typing import Dict
-import queue
 import threading
 import signal
 import numpy
@@ -59,13 +59,14 @@ class Mixer:
         @dn.datanode
         def _node():
             index = 0
+            buffer = numpy.zeros((buffer_length, nchannels), dtype=numpy.float32)
             with scheduler:
                 yield
                 while True:
                     time = index * buffer_length / samplerate + sound_delay - ref_time
-                    data = numpy.zeros((buffer_length, nchannels), dtype=numpy.float32)
+                    buffer.fill(0.0)
                     try:
-                        data = scheduler.send((data, time))
+                        data = scheduler.send((buffer, time))
                     except StopIteration:
                         return
                     yield data
@@ -112,11 +113,14 @@ class Mixer:
             data, time = yield
             offset = round((start_time - time) * samplerate) if start_time is not None else 0
 
+            # skip the elapsed part in blocks of up to one second
+            if offset < 0:
+                dummy = numpy.zeros((min(-offset, max(samplerate, buffer_length)), nchannels), dtype=numpy.float32)
             while offset < 0:
-                length = min(-offset, buffer_length)
-                dummy = numpy.zeros((length, nchannels), dtype=numpy.float32)
+                length = min(-offset, dummy.shape[0])
+                dummy[:length] = 0.0
                 try:
-                    node.send((dummy, time+offset/samplerate))
+                    node.send((dummy[:length], time+offset/samplerate))
                 except StopIteration:
                     return
                 offset += length
@@ -125,12 +129,10 @@ class Mixer:
                 if data.shape[0] < offset:
                     offset -= data.shape[0]
                 else:
-                    data1, data2 = data[:offset], data[offset:]
                     try:
-                        data2 = node.send((data2, time+offset/samplerate))
+                        data[offset:] = node.send((data[offset:], time+offset/samplerate))
                     except StopIteration:
                         return
-                    data = numpy.concatenate((data1, data2), axis=0)
                     offset = 0
 
                 data, time = yield data
@@ -144,18 +146,33 @@ class Mixer:
     def resample(self, node, samplerate=None, channels=None, volume=0.0, start=None, end=None):
         if start is not None or end is not None:
             node = dn.tslice(node, samplerate or self.samplerate, start, end)
+
+        # chain the stages in one pipe, so each chunk goes through one level of nodes
+        stages = []
         if channels is not None and channels != self.nchannels:
-            node = dn.pipe(node, dn.rechannel(self.nchannels))
+            stages.append(dn.rechannel(self.nchannels))
         if samplerate is not None and samplerate != self.samplerate:
-            node = dn.pipe(node, dn.resample(ratio=(self.samplerate, samplerate)))
+            stages.append(dn.resample(ratio=(self.samplerate, samplerate)))
         if volume != 0:
-            node = dn.pipe(node, lambda s: s * 10**(volume/20))
+            gain = 10**(volume/20)
+            stages.append(lambda s: s * gain)
+
+        if stages:
+            node = dn.pipe(node, *stages)
 
         return node
 
-    @functools.lru_cache(maxsize=32)
     def load_sound(self, filepath):
-        return dn.load_sound(filepath, channels=self.nchannels, samplerate=self.samplerate)
+        return self._load_sound(filepath, self.samplerate, self.nchannels)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _load_sound(filepath, samplerate, nchannels):
+        sound = dn.load_sound(filepath, channels=nchannels, samplerate=samplerate)
+        # cached chunks are shared by every playback of this sound
+        for data in sound:
+            data.flags.writeable = False
+        return tuple(sound)
 
     def play(self, node, samplerate=None, channels=None, volume=0.0, start=None, end=None, time=None, zindex=(0,)):
         if isinstance(node, str):
@@ -185,6 +202,7 @@ class DetectorSettings(cfg.Configurable):
     detector_post_avg: float = 0.03
     detector_wait: float = 0.03
     detector_delta: float = 5.48e-6
+    detector_noise_floor: float = 1.0e-8 # mean power below which a frame counts as silence; 0 to disable
 
     knock_delay: float = 0.0
     knock_energy: float = 1.0e-3
@@ -217,38 +235,47 @@ class Detector:
 
         knock_delay = settings.knock_delay
         knock_energy = settings.knock_energy
+        noise_floor = settings.detector_noise_floor
 
         debug_timeit = settings.debug_timeit
 
         @dn.datanode
         def _node():
             prepare = max(post_max, post_avg)
+            hop_time = hop_length / samplerate
+            time_shift = knock_delay - ref_time
 
             window = dn.get_half_Hann_window(win_length)
-            onset = dn.pipe(
-                dn.frame(win_length=win_length, hop_length=hop_length),
-                dn.power_spectrum(win_length=win_length,
-                                  samplerate=samplerate,
-                                  windowing=window,
-                                  weighting=True),
-                dn.onset_strength(1))
+            framer = dn.frame(win_length=win_length, hop_length=hop_length)
+            spectrum = dn.power_spectrum(win_length=win_length,
+                                         samplerate=samplerate,
+                                         windowing=window,
+                                         weighting=True)
+            onset = dn.onset_strength(1)
             picker = dn.pick_peak(pre_max, post_max, pre_avg, post_avg, wait, delta)
+            silence = numpy.zeros((win_length//2+1, nchannels), dtype=numpy.float32)
+            gated = noise_floor > 0
 
-            with scheduler, onset, picker:
+            with scheduler, framer, spectrum, onset, picker:
                 data = yield
-                buffer = [(knock_delay, 0.0)]*prepare
+                buffer = deque([(knock_delay, 0.0)]*prepare)
                 index = 0
                 while True:
                     try:
-                        strength = onset.send(data)
+                        frame = framer.send(data)
+                        # silent frames have no onset; skip their spectrum
+                        if gated and numpy.vdot(frame, frame) < noise_floor * frame.size:
+                            J = silence
+                        else:
+                            J = spectrum.send(frame)
+                        strength = onset.send(J)
                         detected = picker.send(strength)
                     except StopIteration:
                         return
-                    time = index * hop_length / samplerate + knock_delay - ref_time
-                    strength = strength / knock_energy
 
-                    buffer.append((time, strength))
-                    time, strength = buffer.pop(0)
+                    # delay the strength until the picker decides on it
+                    buffer.append((index * hop_time + time_shift, strength / knock_energy))
+                    time, strength = buffer.popleft()
 
                     try:
                         scheduler.send((None, time, strength, detected))
@@ -386,8 +413,8 @@ class Renderer:
                         return
 
                     msg = None
-                    while not msg_queue.empty():
-                        msg = msg_queue.get()
+                    while msg_queue:
+                        msg = msg_queue.popleft()
 
                     if msg is None:
                         res_text = "\r" + "".join(view) + "\r"
@@ -403,17 +430,18 @@ class Renderer:
         display_node = _node()
         if debug_timeit:
             display_node = dn.timeit(display_node, lambda msg: print("display: " + msg))
-        return dn.show(display_node, 1/framerate, hide_cursor=True)
+        # unchanged views are redrawn every few frames, in case other output disturbs the line
+        return dn.show(display_node, 1/framerate, hide_cursor=True, refresh_period=4/framerate)
 
     @classmethod
     def create(clz, settings, ref_time=0.0):
         scheduler = dn.Scheduler()
-        msg_queue = queue.Queue()
+        msg_queue = deque()
         display_node = clz.get_node(scheduler, msg_queue, settings, ref_time)
         return display_node, clz(scheduler, msg_queue)
 
     def message(self, msg):
-        self.msg_queue.put(msg)
+        self.msg_queue.append(msg)
 
     def add_drawer(self, node, zindex=(0,)):
         return self.drawers_scheduler.add_node(node, zindex=zindex)
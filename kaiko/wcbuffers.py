@@ -59,6 +59,7 @@ def clamp(ran, ran_):
 
 def addtext1(view, width, x, text, xmask=slice(None,None)):
     xran = range(width)
+    xran_ = xran[xmask]
     x0 = x
     attrs = ""
 
@@ -87,11 +88,11 @@ def addtext1(view, width, x, text, xmask=slice(None,None)):
             x_ = x - 1
             if x_ in xran and view[x_] == "":
                 x_ -= 1
-            if x_ in xran[xmask]:
+            if x_ in xran_:
                 view[x_] += ch
 
         elif width == 1:
-            if x in xran[xmask]:
+            if x in xran_:
                 if x-1 in xran and view[x] == "":
                     view[x-1] = " "
                 if x+1 in xran and view[x+1] == "":
@@ -101,7 +102,7 @@ def addtext1(view, width, x, text, xmask=slice(None,None)):
 
         elif width == 2:
             x_ = x + 1
-            if x in xran[xmask] and x_ in xran[xmask]:
+            if x in xran_ and x_ in xran_:
                 if x-1 in xran and view[x] == "":
                     view[x-1] = " "
                 if x_+1 in xran and view[x_+1] == "":
@@ -163,8 +164,7 @@ def addpad1(view, width, x, pad, pad_width, xmask=slice(None,None)):
             view[xs.start-1] = " "
         if xs.stop in xran and view[xs.stop] == "":
             view[xs.stop] = " "
-        for x_ in xs:
-            view[x_] = pad[x_-x]
+        view[xs.start:xs.stop] = pad[xs.start-x:xs.stop-x]
 
     return view, xs
 
@@ -194,8 +194,7 @@ def clear1(view, width, xmask=slice(None,None)):
         view[xs.start-1] = " "
     if xs.stop in xran and view[xs.stop] == "":
         view[xs.stop] = " "
-    for x in xs:
-        view[x] = " "
+    view[xmask] = [" "]*len(xs)
 
     return view
 
@@ -203,6 +202,8 @@ def clear1(view, width, xmask=slice(None,None)):
 def addtext2(view, height, width, y, x, text, ymask=slice(None,None), xmask=slice(None,None)):
     yran = range(height)
     xran = range(width)
+    yran_ = yran[ymask]
+    xran_ = xran[xmask]
     x0 = x
     attrs = ""
 
@@ -237,11 +238,11 @@ def addtext2(view, height, width, y, x, text, ymask=slice(None,None), xmask=slic
             x_ = x - 1
             if y in yran and x_ in xran and view[y][x_] == "":
                 x_ -= 1
-            if y in yran[ymask] and x_ in xran[xmask]:
+            if y in yran_ and x_ in xran_:
                 view[y][x_] += ch
 
         elif width == 1:
-            if y in yran[ymask] and x in xran[xmask]:
+            if y in yran_ and x in xran_:
                 if x-1 in xran and view[y][x] == "":
                     view[y][x-1] = " "
                 if x+1 in xran and view[y][x+1] == "":
@@ -251,7 +252,7 @@ def addtext2(view, height, width, y, x, text, ymask=slice(None,None), xmask=slic
 
         elif width == 2:
             x_ = x + 1
-            if y in yran[ymask] and x in xran[xmask] and x_ in xran[xmask]:
+            if y in yran_ and x in xran_ and x_ in xran_:
                 if x-1 in xran and view[y][x] == "":
                     view[y][x-1] = " "
                 if x_+1 in xran and view[y][x_+1] == "":
@@ -339,8 +340,7 @@ def addpad2(view, height, width, y, x, pad, pad_height, pad_width, ymask=slice(N
                 view[y_][xs.start-1] = " "
             if xs.stop in xran and view[y_][xs.stop] == "":
                 view[y_][xs.stop] = " "
-            for x_ in xs:
-                view[y_][x_] = pad[y_-y][x_-x]
+            view[y_][xs.start:xs.stop] = pad[y_-y][xs.start-x:xs.stop-x]
 
     return view, ys, xs
 
@@ -355,7 +355,6 @@ def clear2(view, height, width, ymask=slice(None,None), xmask=slice(None,None)):
             view[y][xs.start-1] = " "
         if xs.stop in xran and view[y][xs.stop] == "":
             view[y][xs.stop] = " "
-        for x in xs:
-            view[y][x] = " "
+        view[y][xmask] = [" "]*len(xs)
 
     return view